@@ -145,6 +145,26 @@ app_license = "mit"
 # 	}
 # }
 
+doc_events = {
+	"Supplier Quotation": {
+		"on_update": "spacex.spacex.procurement_analytics.clear_savings_cache",
+		"on_cancel": "spacex.spacex.procurement_analytics.clear_savings_cache",
+		"on_trash": "spacex.spacex.procurement_analytics.clear_savings_cache",
+	},
+	"Request for Quotation": {
+		"on_submit": "spacex.spacex.procurement_analytics.clear_savings_cache",
+		"on_cancel": "spacex.spacex.procurement_analytics.clear_savings_cache",
+	},
+	"Translation": {
+		"on_update": "spacex.spacex.report.quotation_comparison_report.quotation_comparison_report.clear_column_cache",
+		"on_trash": "spacex.spacex.report.quotation_comparison_report.quotation_comparison_report.clear_column_cache",
+	},
+}
+
+clear_cache = [
+	"spacex.spacex.report.quotation_comparison_report.quotation_comparison_report.clear_column_cache",
+]
+
 # Scheduled Tasks
 # ---------------
 
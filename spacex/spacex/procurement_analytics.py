@@ -0,0 +1,144 @@
+import frappe
+from frappe.utils import flt, get_last_day, getdate, nowdate
+
+
+CACHE_KEY = "spacex:procurement_savings"
+
+# Every bid on a submitted RFQ, ranked the way the Quotation Comparison Report
+# labels them: L1 is the lowest grand total, ties go to the earlier quotation.
+RANKED_BIDS = """
+    SELECT
+        DATE_FORMAT(bid.rfq_date, '%%Y-%%m') as month,
+        bid.rfq_name,
+        sq.supplier,
+        COALESCE(sq.grand_total, 0) as total,
+        ROW_NUMBER() OVER (
+            PARTITION BY bid.rfq_name
+            ORDER BY COALESCE(sq.grand_total, 0), sq.name
+        ) as bid_rank,
+        COUNT(*) OVER (PARTITION BY bid.rfq_name) as bids
+    FROM (
+        SELECT DISTINCT sqi.parent, rfq.name as rfq_name, rfq.transaction_date as rfq_date
+        FROM `tabRequest for Quotation` rfq
+        JOIN `tabSupplier Quotation Item` sqi ON sqi.request_for_quotation = rfq.name
+        WHERE rfq.docstatus = 1
+            AND rfq.transaction_date BETWEEN %(from_date)s AND %(to_date)s
+    ) bid
+    JOIN `tabSupplier Quotation` sq ON sq.name = bid.parent
+    WHERE sq.docstatus IN (0, 1)
+"""
+
+
+@frappe.whitelist()
+def get_savings_analytics(from_date, to_date=None):
+    """Monthly savings, bid counts and supplier win rates across all RFQs.
+
+    Months are keyed by RFQ date and count draft and submitted quotations,
+    the same bids the report compares. Past months are cached until a
+    quotation or RFQ in them changes (see `clear_savings_cache`); the current
+    month is always recomputed.
+    """
+    frappe.has_permission("Supplier Quotation", "read", throw=True)
+
+    current_month = nowdate()[:7]
+    months = get_months(getdate(from_date), getdate(to_date or nowdate()))
+
+    cached = {frappe.safe_decode(month): value for month, value in (frappe.cache.hgetall(CACHE_KEY) or {}).items()}
+    analytics = {month: cached.get(month) for month in months if month < current_month}
+
+    missing = [month for month in months if not analytics.get(month)]
+    if missing:
+        computed = compute_savings(missing[0], missing[-1])
+        for month in missing:
+            analytics[month] = computed.get(month) or empty_month(month)
+            if month < current_month:
+                frappe.cache.hset(CACHE_KEY, month, analytics[month])
+
+    return [analytics[month] for month in months]
+
+
+def compute_savings(from_month, to_month):
+    """Aggregate every month between `from_month` and `to_month` (YYYY-MM) in one query.
+
+    Every RFQ has exactly one L1 bid, so summing supplier wins gives the RFQ
+    count and the month figures can be rolled up from the supplier rows.
+    """
+    values = {"from_date": f"{from_month}-01", "to_date": get_last_day(f"{to_month}-01")}
+
+    analytics = {}
+    for row in frappe.db.sql(f"""
+        SELECT
+            ranked.month,
+            ranked.supplier,
+            COUNT(*) as bids,
+            SUM(CASE WHEN ranked.bid_rank = 1 THEN 1 ELSE 0 END) as wins,
+            SUM(CASE WHEN ranked.bid_rank = 1 AND ranked.bids > 1 THEN ranked.total ELSE 0 END) as l1_total,
+            SUM(CASE WHEN ranked.bid_rank = 2 THEN ranked.total ELSE 0 END) as l2_total
+        FROM ({RANKED_BIDS}) ranked
+        GROUP BY ranked.month, ranked.supplier
+        ORDER BY ranked.month, wins DESC, ranked.supplier
+    """, values, as_dict=1):
+        month = analytics.setdefault(row.month, empty_month(row.month))
+        month["rfqs"] += row.wins
+        month["bids"] += row.bids
+        month["l1_total"] += flt(row.l1_total)
+        month["l2_total"] += flt(row.l2_total)
+        month["suppliers"].append({
+            "supplier": row.supplier,
+            "bids": row.bids,
+            "wins": row.wins,
+            "win_rate": flt(row.wins * 100 / row.bids, 2),
+        })
+
+    for month in analytics.values():
+        month["avg_bids"] = flt(month["bids"] / month["rfqs"], 2)
+        month["savings"] = month["l2_total"] - month["l1_total"]
+        month["savings_percent"] = flt(month["savings"] * 100 / month["l2_total"], 2) if month["l2_total"] else 0
+
+    return analytics
+
+
+def clear_savings_cache(doc, method=None):
+    """Drop the cached months of every RFQ a Supplier Quotation or RFQ touches."""
+    if doc.doctype == "Request for Quotation":
+        rfq_names = {doc.name}
+    else:
+        rfq_names = {d.request_for_quotation for d in doc.items if d.request_for_quotation}
+        # the quotation may have been moved off an RFQ by this save
+        doc_before_save = doc.get_doc_before_save()
+        if doc_before_save:
+            rfq_names.update(d.request_for_quotation for d in doc_before_save.items if d.request_for_quotation)
+
+    if not rfq_names:
+        return
+
+    for month in frappe.db.sql_list("""
+        SELECT DISTINCT DATE_FORMAT(transaction_date, '%%Y-%%m')
+        FROM `tabRequest for Quotation`
+        WHERE name IN %s
+    """, (tuple(rfq_names),)):
+        frappe.cache.hdel(CACHE_KEY, month)
+
+
+def get_months(from_date, to_date):
+    months = []
+    year, month = from_date.year, from_date.month
+    while (year, month) <= (to_date.year, to_date.month):
+        months.append(f"{year}-{month:02d}")
+        year, month = year + month // 12, month % 12 + 1
+
+    return months
+
+
+def empty_month(month):
+    return {
+        "month": month,
+        "rfqs": 0,
+        "bids": 0,
+        "avg_bids": 0,
+        "l1_total": 0,
+        "l2_total": 0,
+        "savings": 0,
+        "savings_percent": 0,
+        "suppliers": [],
+    }
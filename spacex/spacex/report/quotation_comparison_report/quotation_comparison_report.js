@@ -22,6 +22,26 @@ frappe.query_reports["Quotation Comparison Report"] = {
             label: "To Date",
             fieldtype: "Date",
 			
+        },
+        {
+            fieldname: "item_code",
+            label: "Item",
+            fieldtype: "MultiSelectList",
+            get_data: function(txt) {
+                return frappe.db.get_link_options("Item", txt);
+            }
+        },
+        {
+            fieldname: "item_group",
+            label: "Item Group",
+            fieldtype: "Link",
+            options: "Item Group"
+        },
+        {
+            fieldname: "warehouse",
+            label: "Warehouse",
+            fieldtype: "Link",
+            options: "Warehouse"
         }
     ]
 };
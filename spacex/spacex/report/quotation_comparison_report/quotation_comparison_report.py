@@ -255,14 +255,38 @@
 
 
 
+import logging
+
 import frappe
 from frappe import _
 from frappe.utils import flt
-import logging
+from frappe.utils.caching import site_cache
+
+
+def get_logger():
+    """Report logger, written to the site log.
+
+    Set `quotation_comparison_report_log_level` (e.g. "DEBUG") in
+    site_config.json to change the level.
+    """
+    logger = frappe.logger("quotation_comparison_report", allow_site=True)
+    level = get_log_level()
+    if level is not None:
+        logger.setLevel(level)
+    return logger
+
+
+def get_log_level():
+    """Configured level as an int, None when unset or not a valid level name."""
+    level = frappe.conf.get("quotation_comparison_report_log_level")
+    if not level:
+        return None
+    if isinstance(level, int):
+        return level
+
+    level = logging.getLevelName(str(level).upper())
+    return level if isinstance(level, int) else None
 
-# Set up logging for debugging
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger(__name__)
 
 def execute(filters=None):
     try:
@@ -285,11 +309,25 @@ def execute(filters=None):
 
         return columns, data
     except Exception as e:
-        logger.error(f"Error executing report: {str(e)}")
+        get_logger().error(f"Error executing report: {str(e)}")
         frappe.throw(_("An error occurred while generating the report: {0}").format(str(e)))
 
 
 def get_columns(supplier_quotation_count, sorted_supplier_quotations):
+    partner_names = tuple(
+        s_data["partner_name"] for _quote_ref_no, s_data in sorted_supplier_quotations[:supplier_quotation_count]
+    )
+    return [column.copy() for column in build_columns(frappe.local.lang, partner_names)]
+
+
+@site_cache(ttl=60 * 60, maxsize=128)
+def build_columns(lang, partner_names):
+    """Translated column metadata, memoized per site, language and supplier set.
+
+    The memo lives in each worker's own memory. `clear_column_cache` runs on
+    clear-cache and Translation changes but only reaches the process it runs
+    in, so other workers can serve stale labels for up to the one hour TTL.
+    """
     columns = [
         {"label": _("Item Code"), "fieldname": "item_code", "fieldtype": "Link", "options": "Item", "width": 200},
         {"label": _("Item Description"), "fieldname": "description", "fieldtype": "Data", "width": 250},
@@ -297,8 +335,7 @@ def get_columns(supplier_quotation_count, sorted_supplier_quotations):
         {"label": _("Units"), "fieldname": "uom", "fieldtype": "Data", "width": 130},
     ]
 
-    for idx in range(1, supplier_quotation_count + 1):
-        partner_name = sorted_supplier_quotations[idx - 1][1]["partner_name"]
+    for idx, partner_name in enumerate(partner_names, 1):
         columns.extend([
             {
                 "label": _(f"Rate ({partner_name})"),
@@ -323,6 +360,11 @@ def get_columns(supplier_quotation_count, sorted_supplier_quotations):
     return columns
 
 
+def clear_column_cache(*args, **kwargs):
+    """Clear the column memo in this process only; other workers wait for the TTL."""
+    build_columns.clear_cache()
+
+
 def filter_zero_quotation_rows(data, supplier_quotation_count):
     filtered_data = []
     for row in data:
@@ -356,9 +398,16 @@ def filter_zero_quotation_rows(data, supplier_quotation_count):
 
 def get_data(filters):
     data = []
+    if filters.get("item_code"):
+        item_codes = filters["item_code"]
+        filters["item_code"] = tuple([item_codes] if isinstance(item_codes, str) else item_codes)
+
     conditions = get_conditions(filters)
+    rfq_conditions = get_rfq_item_conditions(filters)
+    item_conditions = get_item_conditions(filters, "sqi")
 
-    rfq_items = frappe.db.sql("""
+    rfq_date_map, item_rows = {}, {}
+    for item_code, description, uom, qty, rfq_name, rfq_date in stream_rows(f"""
         SELECT DISTINCT
             rfi.item_code,
             rfi.description, 
@@ -368,21 +417,22 @@ def get_data(filters):
             rfq.transaction_date as rfq_date
         FROM `tabRequest for Quotation Item` rfi
         JOIN `tabRequest for Quotation` rfq ON rfq.name = rfi.parent
-        WHERE rfq.docstatus = 1
+        WHERE rfq.docstatus = 1 {rfq_conditions}
         GROUP BY rfi.item_code, rfi.description, rfi.uom, rfq.name, rfq.transaction_date
         ORDER BY rfi.item_code
-    """, as_dict=1)
+    """, filters):
+        rfq_date_map[rfq_name] = rfq_date
+        item_rows.setdefault(item_code, {
+            "item_code": item_code,
+            "description": description or "",
+            "qty": 0,
+            "uom": uom or "",
+        })
+        item_rows[item_code]["qty"] += qty or 0
 
-    if not rfq_items:
+    if not item_rows:
         return data, 0, []
 
-    total_qty = sum(item.qty or 0 for item in rfq_items)
-
-    rfq_date_map, rfq_item_map = {}, {}
-    for item in rfq_items:
-        rfq_date_map[item.rfq_name] = item.rfq_date
-        rfq_item_map.setdefault(item.rfq_name, []).append(item)
-
     supplier_quotations_meta = frappe.db.sql(f"""
         SELECT DISTINCT
             sq.name as quote_ref_no,
@@ -395,51 +445,45 @@ def get_data(filters):
         ORDER BY sq.name
     """, filters, as_dict=1)
 
-    for sq in supplier_quotations_meta:
-        sq["date"] = rfq_date_map.get(sq.get("rfq_name"))
-
     if not supplier_quotations_meta:
         return data, 0, []
 
-    supplier_quotation_names = [sq["quote_ref_no"] for sq in supplier_quotations_meta]
-    supplier_quotation_items = frappe.db.sql("""
-        SELECT 
-            sqi.parent as quote_ref_no,
-            sqi.item_code,
-            sqi.description,
-            sqi.rate,
-            sqi.amount,
-            sqi.qty
-        FROM `tabSupplier Quotation Item` sqi
-        WHERE sqi.parent IN %s
-        ORDER BY sqi.item_code
-    """, (tuple(supplier_quotation_names),), as_dict=1)
-
     supplier_data = {}
     for sq_meta in supplier_quotations_meta:
         quote_ref_no = sq_meta["quote_ref_no"]
         supplier_data[quote_ref_no] = {
             "partner_name": sq_meta["partner_name"],
             "quote_ref_no": quote_ref_no,
-            "date": sq_meta["date"],
+            "date": rfq_date_map.get(sq_meta["rfq_name"]),
             "rfq_name": sq_meta["rfq_name"],
-            "items": [],
-            "total": sq_meta["supplier_total"] or 0
+            # item_code -> (rate, amount, qty), the first quoted line wins
+            "items": {},
+            "total": sq_meta["supplier_total"] or 0,
+            "total_rate": 0,
+            "line_total": 0,
         }
 
-    for sqi in supplier_quotation_items:
-        quote_ref_no = sqi["quote_ref_no"]
-        if quote_ref_no in supplier_data:
-            supplier_data[quote_ref_no]["items"].append({
-                "item_code": sqi["item_code"],
-                "description": sqi["description"],
-                "rate": sqi["rate"] or 0,
-                "amount": sqi["amount"] or 0,
-                "qty": sqi["qty"] or 0
-            })
-
-    for quote_ref_no in supplier_data:
-        supplier_data[quote_ref_no]["total_rate"] = sum(item["rate"] or 0 for item in supplier_data[quote_ref_no]["items"])
+    for quote_ref_no, item_code, rate, amount, qty in stream_rows(f"""
+        SELECT 
+            sqi.parent as quote_ref_no,
+            sqi.item_code,
+            sqi.rate,
+            sqi.amount,
+            sqi.qty
+        FROM `tabSupplier Quotation Item` sqi
+        WHERE sqi.parent IN %(quotations)s {item_conditions}
+        ORDER BY sqi.item_code
+    """, dict(filters, quotations=tuple(supplier_data))):
+        s_data = supplier_data[quote_ref_no]
+        s_data["items"].setdefault(item_code, (rate or 0, amount or 0, qty or 0))
+        s_data["total_rate"] += rate or 0
+        s_data["line_total"] += amount or 0
+
+    if item_conditions:
+        # the grand total covers lines outside the item filters, so rank
+        # and total on the matching lines only
+        for s_data in supplier_data.values():
+            s_data["total"] = s_data["line_total"]
 
     sorted_supplier_quotations = sorted(
         supplier_data.items(),
@@ -450,18 +494,6 @@ def get_data(filters):
     for idx, (quote_ref_no, _) in enumerate(sorted_supplier_quotations, 1):
         supplier_data[quote_ref_no]["label"] = f"L{idx}"
 
-    item_rows = {}
-    for rfq_name, items in rfq_item_map.items():
-        for item in items:
-            item_code = item.item_code
-            item_rows.setdefault(item_code, {
-                "item_code": item_code,
-                "description": item.description or "",
-                "qty": 0,
-                "uom": item.uom or "",
-            })
-            item_rows[item_code]["qty"] += item.qty or 0
-
     for item_code, row_data in item_rows.items():
         row = {
             "item_code": row_data["item_code"],
@@ -470,16 +502,13 @@ def get_data(filters):
             "uom": row_data["uom"],
         }
         for idx, (quote_ref_no, s_data) in enumerate(sorted_supplier_quotations, 1):
-            item_data = next(
-                (i for i in s_data["items"] if i["item_code"] == item_code),
-                {"rate": 0, "amount": 0, "qty": 0}
-            )
+            rate, amount, qty = s_data["items"].get(item_code, (0, 0, 0))
             row.update({
-                f"quoted_qty_{idx}": flt(item_data.get("qty", 0)),
+                f"quoted_qty_{idx}": flt(qty),
                 f"quote_ref_no_{idx}": s_data["quote_ref_no"],
                 f"date_{idx}": s_data["date"],
-                f"rate_{idx}": item_data.get("rate", 0),
-                f"amount_{idx}": item_data.get("amount", 0),
+                f"rate_{idx}": rate,
+                f"amount_{idx}": amount,
                 f"label_{idx}": s_data["label"],
             })
         data.append(row)
@@ -503,6 +532,15 @@ def get_data(filters):
     return data, supplier_quotation_count, sorted_supplier_quotations
 
 
+def stream_rows(query, values):
+    """Yield result tuples from an unbuffered cursor as the server sends them.
+
+    The generator must be exhausted before the next query is run.
+    """
+    with frappe.db.unbuffered_cursor():
+        yield from frappe.db.sql(query, values, as_iterator=True)
+
+
 def get_conditions(filters):
     conditions = []
     if filters.get("rfq"):
@@ -513,5 +551,46 @@ def get_conditions(filters):
         conditions.append("sq.transaction_date <= %(to_date)s")
     if filters.get("supplier"):
         conditions.append("sq.supplier = %(supplier)s")
+    conditions.extend(get_item_filters(filters, "sqi"))
+
+    return " AND " + " AND ".join(conditions) if conditions else ""
+
+
+def get_rfq_item_conditions(filters):
+    conditions = []
+    if filters.get("rfq"):
+        conditions.append("rfq.name = %(rfq)s")
+    if filters.get("supplier") or filters.get("from_date") or filters.get("to_date"):
+        # only RFQs that have a quotation matching the supplier and dates
+        conditions.append(f"""rfq.name IN (
+            SELECT sqi.request_for_quotation
+            FROM `tabSupplier Quotation` sq
+            JOIN `tabSupplier Quotation Item` sqi ON sqi.parent = sq.name
+            WHERE sq.docstatus IN (0, 1) {get_conditions(filters)}
+        )""")
+    conditions.extend(get_item_filters(filters, "rfi"))
+
+    return " AND " + " AND ".join(conditions) if conditions else ""
+
 
+def get_item_conditions(filters, alias):
+    conditions = get_item_filters(filters, alias)
     return " AND " + " AND ".join(conditions) if conditions else ""
+
+
+def get_item_filters(filters, alias):
+    """Item level filters for an RFQ or Supplier Quotation Item table alias."""
+    conditions = []
+    if filters.get("item_code"):
+        conditions.append(f"{alias}.item_code IN %(item_code)s")
+    if filters.get("item_group"):
+        conditions.append(f"""{alias}.item_group IN (
+            SELECT ig.name
+            FROM `tabItem Group` ig
+            JOIN `tabItem Group` parent_ig ON ig.lft >= parent_ig.lft AND ig.rgt <= parent_ig.rgt
+            WHERE parent_ig.name = %(item_group)s
+        )""")
+    if filters.get("warehouse"):
+        conditions.append(f"{alias}.warehouse = %(warehouse)s")
+
+    return conditions
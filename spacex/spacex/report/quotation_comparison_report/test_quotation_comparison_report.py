@@ -0,0 +1,202 @@
+import subprocess
+import sys
+import tracemalloc
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from spacex.spacex.report.quotation_comparison_report import quotation_comparison_report as report
+from spacex.spacex.report.quotation_comparison_report.quotation_comparison_report import (
+    clear_column_cache,
+    execute,
+    get_columns,
+    get_log_level,
+)
+from spacex.tests.stand_in_db import StandInDatabase, make_procurement_data, use_stand_in_db
+
+
+# Budgets for one `execute` call against the generated data set
+# (20 RFQs x 30 items, each answered by 4 suppliers). `peak_memory` is the
+# tracemalloc peak in bytes while the report runs. It is mostly the report
+# output and varies with the Python version and translation loading, so it is
+# set at about 2.5x the measured peak and only catches gross regressions;
+# `test_large_queries_are_streamed` guards the fetch path itself.
+QUERY_BUDGETS = {
+    "single_rfq": {
+        "filters": {"rfq": "RFQ-0005"},
+        "round_trips": 3,
+        "rows": 160,
+        "bytes": 10_000,
+        "peak_memory": 256 * 1024,
+    },
+    "supplier_date_range": {
+        "filters": {"supplier": "SUP-02", "from_date": "2025-02-01", "to_date": "2025-03-31"},
+        "round_trips": 3,
+        # 8 RFQs quoted by SUP-02 in range: 240 RFQ items, 8 quotations, 240 lines
+        "rows": 520,
+        "bytes": 25_000,
+        "peak_memory": 2 * 1024 * 1024,
+    },
+    "item_group": {
+        "filters": {"item_group": "Cables"},
+        "round_trips": 3,
+        "rows": 900,
+        "bytes": 36_000,
+        "peak_memory": 6 * 1024 * 1024,
+    },
+    "no_filters": {
+        "filters": {},
+        "round_trips": 3,
+        "rows": 3_200,
+        "bytes": 200_000,
+        "peak_memory": 24 * 1024 * 1024,
+    },
+}
+
+# Seconds to import the report module once frappe is loaded, best of
+# IMPORT_RUNS fresh interpreters. Generous on purpose: a cold import costs a
+# few milliseconds and the limit only has to catch something heavy creeping in.
+IMPORT_TIME_BUDGET = 0.25
+IMPORT_RUNS = 5
+
+
+class TestQuotationComparisonReportQueryBudget(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.db = make_procurement_data(StandInDatabase())
+
+    def test_query_budgets(self):
+        for shape, budget in QUERY_BUDGETS.items():
+            with self.subTest(shape=shape):
+                with use_stand_in_db(self.db) as recorder:
+                    tracemalloc.start()
+                    try:
+                        columns, data = execute(dict(budget["filters"]))
+                        peak_memory = tracemalloc.get_traced_memory()[1]
+                    finally:
+                        tracemalloc.stop()
+
+                self.assertTrue(data)
+                self.assertLessEqual(peak_memory, budget["peak_memory"], f"{shape}: peak memory over budget")
+                for metric in ("round_trips", "rows", "bytes"):
+                    self.assertLessEqual(
+                        getattr(recorder, metric),
+                        budget[metric],
+                        f"{shape}: {metric} over budget\n{recorder.summary()}",
+                    )
+
+    def test_single_rfq_only_fetches_its_items(self):
+        with use_stand_in_db(self.db) as recorder:
+            columns, data = execute({"rfq": "RFQ-0005"})
+
+        rfq_item_call = recorder.calls[0]
+        self.assertEqual(rfq_item_call["rows"], 30)
+        # 30 item rows and the total row, 4 suppliers with 3 columns each
+        self.assertEqual(len(data), 31)
+        self.assertEqual(len(columns), 4 + 4 * 3)
+
+    def test_large_queries_are_streamed(self):
+        with use_stand_in_db(self.db) as recorder:
+            execute({})
+
+        rfq_items, quotations, quotation_items = recorder.calls
+        self.assertTrue(rfq_items["streamed"])
+        self.assertFalse(quotations["streamed"])
+        self.assertTrue(quotation_items["streamed"])
+
+    def test_item_group_includes_descendants(self):
+        with use_stand_in_db(self.db) as recorder:
+            columns, data = execute({"rfq": "RFQ-0005", "item_group": "Electrical"})
+
+        item_codes = [row["item_code"] for row in data if row["description"] != "TOTAL AMOUNT"]
+        self.assertTrue(item_codes)
+        # Electrical holds Cables and Switches, the first two of every four items
+        self.assertTrue(all((int(code[-4:]) - 1) % 4 < 2 for code in item_codes))
+        for call in recorder.calls:
+            self.assertIn("`tabItem Group`", call["query"])
+
+    def test_item_code_filter(self):
+        with use_stand_in_db(self.db) as recorder:
+            columns, data = execute({"rfq": "RFQ-0005", "item_code": ["ITEM-0012", "ITEM-0025"]})
+
+        self.assertEqual([row["item_code"] for row in data], ["ITEM-0012", "ITEM-0025", ""])
+        self.assertEqual(recorder.calls[0]["rows"], 2)
+        # 4 suppliers quoting 2 lines each
+        self.assertEqual(recorder.calls[2]["rows"], 8)
+
+    def test_warehouse_filter_totals_matching_lines(self):
+        with use_stand_in_db(self.db):
+            columns, data = execute({"supplier": "SUP-01", "warehouse": "Site - SX"})
+
+        total_row = data[-1]
+        item_rows = data[:-1]
+        self.assertTrue(all(int(row["item_code"][-4:]) % 2 == 0 for row in item_rows))
+        for idx in range(1, len(columns[4:]) // 3 + 1):
+            self.assertAlmostEqual(
+                total_row[f"amount_{idx}"], sum(row[f"amount_{idx}"] for row in item_rows)
+            )
+
+
+class TestQuotationComparisonReportImport(FrappeTestCase):
+    def test_import_is_lean(self):
+        timings = []
+        for _run in range(IMPORT_RUNS):
+            # a fresh interpreter, so nothing else has configured logging yet
+            result = subprocess.run(
+                [sys.executable, "-c", """
+import logging, time
+import frappe
+start = time.perf_counter()
+import spacex.spacex.report.quotation_comparison_report.quotation_comparison_report
+print(time.perf_counter() - start)
+root = logging.getLogger()
+print(root.level, len(root.handlers))
+"""],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            elapsed, logging_state = result.stdout.splitlines()[-2:]
+            self.assertEqual(logging_state, "30 0", "importing the report configured logging")
+            timings.append(float(elapsed))
+
+        self.assertLess(min(timings), IMPORT_TIME_BUDGET)
+
+    def test_columns_are_memoized_per_site(self):
+        suppliers = [("SQ-1", {"partner_name": "SUP-01"}), ("SQ-2", {"partner_name": "SUP-02"})]
+        clear_column_cache()
+        self.addCleanup(clear_column_cache)
+
+        with patch.object(report, "_", side_effect=lambda label: label) as translate:
+            columns = get_columns(2, suppliers)
+            columns[4]["label"] = "changed"
+            again = get_columns(2, suppliers)
+            self.assertEqual(translate.call_count, 4 + 2 * 3)
+            self.assertEqual(len(again), 4 + 2 * 3)
+            self.assertEqual(again[4]["label"], "Rate (SUP-01)")
+
+            with patch.object(frappe.local, "site", "other.site"):
+                get_columns(2, suppliers)
+            self.assertEqual(translate.call_count, 2 * (4 + 2 * 3))
+
+            clear_column_cache()
+            get_columns(2, suppliers)
+            self.assertEqual(translate.call_count, 3 * (4 + 2 * 3))
+
+    def test_log_level_from_site_config(self):
+        for configured, expected in (("debug", 10), ("WARNING", 30), (10, 10), ("verbose", None), (None, None)):
+            with self.subTest(configured=configured), patch.object(
+                frappe, "conf", frappe._dict(quotation_comparison_report_log_level=configured)
+            ):
+                self.assertEqual(get_log_level(), expected)
+
+    def test_bad_log_level_does_not_hide_report_error(self):
+        with patch.object(frappe, "conf", frappe._dict(quotation_comparison_report_log_level="verbose")), patch.object(
+            report, "get_data", side_effect=Exception("boom")
+        ):
+            with self.assertRaises(frappe.ValidationError) as raised:
+                execute({})
+
+        self.assertIn("boom", str(raised.exception))
@@ -0,0 +1,85 @@
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from spacex.spacex import procurement_analytics
+from spacex.spacex.procurement_analytics import CACHE_KEY, clear_savings_cache, get_savings_analytics
+from spacex.spacex.report.quotation_comparison_report.quotation_comparison_report import execute
+from spacex.tests.stand_in_db import StandInDatabase, make_procurement_data, use_stand_in_db
+
+
+class TestProcurementAnalytics(FrappeTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.db = make_procurement_data(StandInDatabase())
+
+    def setUp(self):
+        frappe.cache.delete_value(CACHE_KEY)
+        self.addCleanup(frappe.cache.delete_value, CACHE_KEY)
+
+    def get_analytics(self, from_date, to_date=None, today="2025-04-15", db=None):
+        with use_stand_in_db(db or self.db) as recorder, patch.object(procurement_analytics, "nowdate", return_value=today):
+            return get_savings_analytics(from_date, to_date), recorder
+
+    def test_matches_report_ranking(self):
+        (january,), recorder = self.get_analytics("2025-01-01", "2025-01-31")
+
+        # RFQ-0001 to RFQ-0004 are dated in January
+        winners = Counter()
+        with use_stand_in_db(self.db):
+            for rfq in ("RFQ-0001", "RFQ-0002", "RFQ-0003", "RFQ-0004"):
+                columns, data = execute({"rfq": rfq})
+                winners[columns[4]["label"][len("Rate ("):-1]] += 1
+
+        self.assertEqual(recorder.round_trips, 1)
+        self.assertEqual(january["rfqs"], 4)
+        self.assertEqual(january["bids"], 16)
+        self.assertEqual(january["avg_bids"], 4)
+        self.assertGreater(january["savings"], 0)
+        self.assertEqual({s["supplier"]: s["wins"] for s in january["suppliers"] if s["wins"]}, dict(winners))
+
+    def test_closed_months_are_cached(self):
+        first, recorder = self.get_analytics("2025-01-01")
+        self.assertEqual([month["month"] for month in first], ["2025-01", "2025-02", "2025-03", "2025-04"])
+        self.assertEqual(recorder.round_trips, 1)
+
+        second, recorder = self.get_analytics("2025-01-01")
+        self.assertEqual(second, first)
+        # only the current month is queried again
+        self.assertEqual(recorder.round_trips, 1)
+        self.assertEqual(recorder.rows, 4)
+
+        closed, recorder = self.get_analytics("2025-01-01", "2025-03-31")
+        self.assertEqual(closed, first[:3])
+        self.assertEqual(recorder.round_trips, 0)
+
+    def test_months_without_rfqs(self):
+        (month,), recorder = self.get_analytics("2024-06-01", "2024-06-30")
+        self.assertEqual(month["rfqs"], 0)
+        self.assertEqual(month["suppliers"], [])
+
+    def test_late_quotation_clears_its_month(self):
+        db = make_procurement_data(StandInDatabase())
+        late_quotation = db.conn.execute("SELECT * FROM `tabSupplier Quotation` WHERE name = 'SQ-0004-04'").fetchone()
+        db.conn.execute("DELETE FROM `tabSupplier Quotation` WHERE name = 'SQ-0004-04'")
+
+        (january,), recorder = self.get_analytics("2025-01-01", "2025-01-31", today="2025-02-01", db=db)
+        self.assertEqual(january["bids"], 15)
+
+        # RFQ-0004 is dated 2025-01-27, its last quotation comes in on 2025-02-02
+        db.conn.execute("INSERT INTO `tabSupplier Quotation` VALUES (?, ?, ?, ?, ?)", late_quotation)
+        quotation = SimpleNamespace(
+            doctype="Supplier Quotation",
+            items=[SimpleNamespace(request_for_quotation="RFQ-0004")],
+            get_doc_before_save=lambda: None,
+        )
+        with use_stand_in_db(db):
+            clear_savings_cache(quotation, "on_update")
+
+        (january,), recorder = self.get_analytics("2025-01-01", "2025-01-31", today="2025-02-10", db=db)
+        self.assertEqual(january["bids"], 16)
+        self.assertEqual(recorder.round_trips, 1)
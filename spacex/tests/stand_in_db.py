@@ -0,0 +1,291 @@
+"""Local stand-in database for report tests.
+
+Reports in this app talk to the database only through `frappe.db.sql`. The
+helpers here replace `frappe.db` with an in-memory SQLite database holding
+just the procurement tables the reports read, fill it with generated data and
+record every round trip so tests can put a budget on it.
+"""
+
+import random
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import frappe
+
+
+SCHEMA = """
+CREATE TABLE `tabRequest for Quotation` (
+    name TEXT PRIMARY KEY,
+    transaction_date TEXT,
+    docstatus INTEGER
+);
+CREATE TABLE `tabRequest for Quotation Item` (
+    name TEXT PRIMARY KEY,
+    parent TEXT,
+    item_code TEXT,
+    description TEXT,
+    uom TEXT,
+    qty REAL,
+    item_group TEXT,
+    warehouse TEXT
+);
+CREATE TABLE `tabSupplier Quotation` (
+    name TEXT PRIMARY KEY,
+    supplier TEXT,
+    transaction_date TEXT,
+    grand_total REAL,
+    docstatus INTEGER
+);
+CREATE TABLE `tabSupplier Quotation Item` (
+    name TEXT PRIMARY KEY,
+    parent TEXT,
+    item_code TEXT,
+    description TEXT,
+    rate REAL,
+    amount REAL,
+    qty REAL,
+    request_for_quotation TEXT,
+    item_group TEXT,
+    warehouse TEXT
+);
+CREATE TABLE `tabItem Group` (
+    name TEXT PRIMARY KEY,
+    parent_item_group TEXT,
+    lft INTEGER,
+    rgt INTEGER
+);
+CREATE INDEX rfq_item_code ON `tabRequest for Quotation Item` (item_code);
+CREATE INDEX sq_item_code ON `tabSupplier Quotation Item` (item_code);
+CREATE INDEX rfq_item_parent ON `tabRequest for Quotation Item` (parent);
+CREATE INDEX sq_item_parent ON `tabSupplier Quotation Item` (parent);
+CREATE INDEX sq_item_rfq ON `tabSupplier Quotation Item` (request_for_quotation);
+"""
+
+NAMED_PARAM = re.compile(r"%\((\w+)\)s")
+
+# (name, parent, lft, rgt) of a small nested set; items are spread over the leaves
+ITEM_GROUPS = [
+    ("All Item Groups", None, 1, 14),
+    ("Electrical", "All Item Groups", 2, 7),
+    ("Cables", "Electrical", 3, 4),
+    ("Switches", "Electrical", 5, 6),
+    ("Mechanical", "All Item Groups", 8, 13),
+    ("Fasteners", "Mechanical", 9, 10),
+    ("Bearings", "Mechanical", 11, 12),
+]
+LEAF_ITEM_GROUPS = ["Cables", "Switches", "Fasteners", "Bearings"]
+WAREHOUSES = ["Stores - SX", "Site - SX"]
+
+
+class StandInDatabase:
+    """Minimal `frappe.db` replacement backed by in-memory SQLite.
+
+    Queries are written for MariaDB, so pymysql style placeholders are
+    rewritten before execution. A tuple bound to a placeholder is expanded
+    into a parenthesised list, the same way pymysql escapes it for `IN %s`.
+    """
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.create_function("DATE_FORMAT", 2, date_format)
+        self.conn.executescript(SCHEMA)
+
+    def insert(self, table, rows):
+        if not rows:
+            return
+        fields = list(rows[0])
+        self.conn.executemany(
+            f"INSERT INTO `tab{table}` ({', '.join(fields)}) VALUES ({', '.join('?' * len(fields))})",
+            [tuple(row[f] for f in fields) for row in rows],
+        )
+
+    @contextmanager
+    def unbuffered_cursor(self):
+        # sqlite cursors already step through results lazily
+        yield
+
+    def sql(self, query, values=(), as_dict=0, as_list=0, as_iterator=False, **kwargs):
+        query, params = self.translate(query, values)
+        cursor = self.conn.execute(query, params)
+        if cursor.description is None:
+            return ()
+
+        if as_iterator and not (as_dict or as_list):
+            return cursor
+
+        fields = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+        if as_dict:
+            return [frappe._dict(zip(fields, row)) for row in rows]
+        if as_list:
+            return [list(row) for row in rows]
+        return tuple(rows)
+
+    def sql_list(self, query, values=(), **kwargs):
+        return [row[0] for row in self.sql(query, values, **kwargs)]
+
+    def translate(self, query, values):
+        if isinstance(values, dict):
+            params = {}
+
+            def placeholder(match):
+                key = match.group(1)
+                value = values[key]
+                if isinstance(value, (tuple, list)):
+                    names = [f"{key}_{i}" for i in range(len(value))]
+                    params.update(zip(names, value))
+                    return "(" + ", ".join(f":{name}" for name in names) + ")"
+                params[key] = value
+                return f":{key}"
+
+            return NAMED_PARAM.sub(placeholder, query).replace("%%", "%"), params
+
+        values = list(values or ())
+        params = []
+        parts = query.split("%s")
+        translated = [parts[0]]
+        for value, part in zip(values, parts[1:]):
+            if isinstance(value, (tuple, list)):
+                translated.append("(" + ", ".join("?" * len(value)) + ")")
+                params.extend(value)
+            else:
+                translated.append("?")
+                params.append(value)
+            translated.append(part)
+
+        return "".join(translated).replace("%%", "%"), params
+
+
+class QueryRecorder:
+    """Wraps a `sql` callable and records round trips, rows and bytes fetched."""
+
+    def __init__(self, sql):
+        self._sql = sql
+        self.calls = []
+
+    def __call__(self, query, *args, **kwargs):
+        result = self._sql(query, *args, **kwargs)
+        call = {"query": " ".join(query.split()), "rows": 0, "bytes": 0, "streamed": bool(kwargs.get("as_iterator"))}
+        self.calls.append(call)
+        if kwargs.get("as_iterator"):
+            return self._count(call, result)
+
+        call["rows"] = len(result)
+        call["bytes"] = sum(row_size(row) for row in result)
+        return result
+
+    def _count(self, call, rows):
+        for row in rows:
+            call["rows"] += 1
+            call["bytes"] += row_size(row)
+            yield row
+
+    @property
+    def round_trips(self):
+        return len(self.calls)
+
+    @property
+    def rows(self):
+        return sum(call["rows"] for call in self.calls)
+
+    @property
+    def bytes(self):
+        return sum(call["bytes"] for call in self.calls)
+
+    def summary(self):
+        return "\n".join(
+            f"{call['rows']:>6} rows {call['bytes']:>8} bytes  {call['query'][:120]}"
+            for call in self.calls
+        )
+
+
+def date_format(value, fmt):
+    # MariaDB's %Y, %m and %d match strftime
+    return date.fromisoformat(str(value)[:10]).strftime(fmt) if value else None
+
+
+def row_size(row):
+    values = row.values() if isinstance(row, dict) else row
+    return sum(len(str(value).encode()) for value in values if value is not None)
+
+
+@contextmanager
+def use_stand_in_db(db):
+    """Route `frappe.db` to the stand-in and record every `sql` call."""
+    recorder = QueryRecorder(db.sql)
+    with patch.object(frappe, "db", db), patch.object(db, "sql", recorder):
+        yield recorder
+
+
+def make_procurement_data(db, rfqs=20, items_per_rfq=30, suppliers=4, item_pool=200, seed=1):
+    """Generate submitted RFQs, each answered by every supplier.
+
+    Names are deterministic (`RFQ-0001`, `SUP-01`, `SQ-0001-01`, ...) so tests
+    can build filters without querying. RFQs are spread one week apart starting
+    2025-01-06 and the matching quotations are dated three days later.
+    `ITEM-0001` is in `Cables`, `ITEM-0002` in `Switches` and so on round
+    `LEAF_ITEM_GROUPS`; odd numbered items are requested for `Stores - SX`,
+    even ones for `Site - SX`.
+    """
+    rng = random.Random(seed)
+    item_codes = [f"ITEM-{i:04d}" for i in range(1, item_pool + 1)]
+    item_group = {code: LEAF_ITEM_GROUPS[i % len(LEAF_ITEM_GROUPS)] for i, code in enumerate(item_codes)}
+    warehouse = {code: WAREHOUSES[i % len(WAREHOUSES)] for i, code in enumerate(item_codes)}
+    rfq_rows, rfq_item_rows, sq_rows, sq_item_rows = [], [], [], []
+
+    for r in range(1, rfqs + 1):
+        rfq_name = f"RFQ-{r:04d}"
+        rfq_date = date(2025, 1, 6) + timedelta(weeks=r - 1)
+        rfq_rows.append({"name": rfq_name, "transaction_date": str(rfq_date), "docstatus": 1})
+
+        lines = [(code, rng.randint(1, 50)) for code in sorted(rng.sample(item_codes, items_per_rfq))]
+        for idx, (item_code, qty) in enumerate(lines, 1):
+            rfq_item_rows.append({
+                "name": f"{rfq_name}-{idx}",
+                "parent": rfq_name,
+                "item_code": item_code,
+                "description": f"Description of {item_code}",
+                "uom": "Nos",
+                "qty": qty,
+                "item_group": item_group[item_code],
+                "warehouse": warehouse[item_code],
+            })
+
+        for s in range(1, suppliers + 1):
+            sq_name = f"SQ-{r:04d}-{s:02d}"
+            grand_total = 0
+            for idx, (item_code, qty) in enumerate(lines, 1):
+                rate = round(rng.uniform(10, 500), 2)
+                grand_total += rate * qty
+                sq_item_rows.append({
+                    "name": f"{sq_name}-{idx}",
+                    "parent": sq_name,
+                    "item_code": item_code,
+                    "description": f"Description of {item_code}",
+                    "rate": rate,
+                    "amount": rate * qty,
+                    "qty": qty,
+                    "request_for_quotation": rfq_name,
+                    "item_group": item_group[item_code],
+                    "warehouse": warehouse[item_code],
+                })
+            sq_rows.append({
+                "name": sq_name,
+                "supplier": f"SUP-{s:02d}",
+                "transaction_date": str(rfq_date + timedelta(days=3)),
+                "grand_total": grand_total,
+                "docstatus": 1,
+            })
+
+    db.insert("Item Group", [
+        {"name": name, "parent_item_group": parent, "lft": lft, "rgt": rgt}
+        for name, parent, lft, rgt in ITEM_GROUPS
+    ])
+    db.insert("Request for Quotation", rfq_rows)
+    db.insert("Request for Quotation Item", rfq_item_rows)
+    db.insert("Supplier Quotation", sq_rows)
+    db.insert("Supplier Quotation Item", sq_item_rows)
+    return db